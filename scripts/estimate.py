@@ -5,21 +5,29 @@ Preprocesses files to remove SystemVerilog features not supported by older Yosys
 """
 
 import subprocess
+import json
+import hashlib
+import argparse
+import tempfile
 import re
 import glob
 import sys
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
 from datetime import datetime
 import multiprocessing
-from concurrent.futures import ProcessPoolExecutor, as_completed
 from functools import lru_cache
+from operator import itemgetter
+from collections import Counter
 import os
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional, Iterator, Iterable, TextIO
 import logging
-import concurrent.futures
 import time
 import threading
 import math
+import queue
+import select
+import mmap
+from contextlib import contextmanager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,11 +35,118 @@ logger = logging.getLogger(__name__)
 
 # Constants
 AREA_PER_CELL = 100  # nm² for 7nm technology
-CACHE_SIZE = 128  # Number of results to cache
-MAX_WORKERS = 4  # Use all available CPU cores
+CACHE_SIZE = None  # Unbounded: prettify_name inputs are bounded by the file count
+# Default worker count: the CPUs this process may run on (respects container/cgroup affinity limits)
+MAX_WORKERS = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else multiprocessing.cpu_count()
 TIMEOUT = 7200  # 2 hours per file (per Yosys run).
-# Max total time (worst case, every file hits timeout): ceil(num_files / MAX_WORKERS) * TIMEOUT
-# Example: 72 files, 4 workers, 60s → ceil(72/4)*60 = 18*60 = 1080 s ≈ 18 minutes.
+# Max total time (worst case, every file hits timeout): ceil(num_files / jobs) * TIMEOUT,
+# where jobs (-j) defaults to MAX_WORKERS, the CPUs in this process's affinity mask
+# Example: 72 files, 16 CPUs → ceil(72/16)*7200 = 5*7200 = 36000 s = 10 hours.
+# Yosys log (relative to script location); workers write per-PID shards that main() merges
+YOSYS_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'yosys_output.log')
+LOG_BUFFER_SIZE = 128 * 1024
+# Temporary files (preprocessed SV, stat JSON) go to tmpfs when available
+TMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# On-disk result cache, keyed on input content + Yosys version + script, plus PREPROCESS_VERSION
+# for results of the preprocessed fallback (relative to root directory)
+CACHE_DIR = os.path.join("generated", ".yosys_cache")
+
+# Run settings filled in by main() and handed to pool workers
+CONFIG = {
+    'use_cache': True,
+    'yosys_version': '',
+    'fast': False,
+}
+
+# Version of the SV preprocessing (preprocess_sv_file, _hoist_logic_from_always); bump it
+# whenever their output changes, so cached results of the preprocessed fallback are redone
+PREPROCESS_VERSION = "1"
+
+# Time allowed for reading and elaborating the unpreprocessed file (SV_READ_SCRIPT) before
+# it is retried under TIMEOUT; synthesis of an accepted file always gets the full TIMEOUT
+DIRECT_READ_TIMEOUT = 30
+
+# How long a starting pool worker waits for its core from process_files' queue
+# (the parent's Queue feeder thread may not have flushed every put() yet)
+CORE_QUEUE_TIMEOUT = 10
+
+# Interactive Yosys shell for SystemVerilog files (scripts are fed on stdin)
+YOSYS_SHELL_CMD = ['yosys', '-Q', '-T']
+# Read + elaborate, then synthesize; the direct attempt runs the two halves separately
+# so only the first is under DIRECT_READ_TIMEOUT
+SV_READ_SCRIPT = """{reader} -sv {path}
+hierarchy -top {top}
+"""
+SV_SYNTH_SCRIPT = """proc
+techmap -map +/techmap.v
+opt_clean
+tee -o {stat_file} stat -json
+"""
+# --fast: no techmap/opt_clean, so counts are RTL-level cells rather than post-mapping gates
+SV_FAST_SYNTH_SCRIPT = """proc
+opt -fast
+tee -o {stat_file} stat -json
+"""
+SV_SCRIPT = SV_READ_SCRIPT + SV_SYNTH_SCRIPT
+SV_FAST_SCRIPT = SV_READ_SCRIPT + SV_FAST_SYNTH_SCRIPT
+
+# Precompiled patterns (avoid re's cache lookup on every call in the hot paths)
+# prettify_name
+_CFG_RE = re.compile(r'CFG_FP_(\w+)_(\d+)_(\d+)')
+_HARDFLOAT_RE = re.compile(r'FP(\w+)_(\d+)_(\d+)')
+_OPENFLOAT_RE = re.compile(r'FP_(\w+)_(\d+)_(\d+)')
+_OPENFLOAT_DIV_RE = re.compile(r'FP_(\w+)_(\d+)_(\d+)_(\d+)')
+_RIAL_RE = re.compile(r'Rial(\w+)(FP\d+)')
+_RIAL_EM_RE = re.compile(r'(Rial\w+)(_e(\d+)_m(\d+)_s\d+)')
+_RIAL_PHASE_RE = re.compile(r'(Rial\w+Phase1\w+Phase2\w+)(_e(\d+)_m(\d+)_s\d+)')
+# _hoist_logic_from_always
+_HOIST_TOKEN_RE = re.compile(
+    r'//[^\n]*'
+    r'|/\*.*?\*/'
+    r'|^(?P<always>(?P<indent>[^\S\n]*)always[^\S\n]+@[^\S\n]*\([^)\n]+\)[^\S\n]+begin\b)'
+    r'|(?P<begin>\bbegin\b)'
+    r'|(?P<end>\bend\b)'
+    r'|^(?P<decl>[^\S\n]*logic[^\S\n]+(?P<typ>\[[^\]\n]+\][^\S\n]+)?(?P<name>\w+)[^\S\n]*=)',
+    re.MULTILINE | re.DOTALL)
+_ALWAYS_RE = re.compile(r'(?P<indent>[^\S\n]*)always[^\S\n]+@[^\S\n]*\([^)\n]+\)[^\S\n]+begin\b')
+# preprocess_sv_file
+_AUTOMATIC_RE = re.compile(r'\bautomatic[^\S\n]+')
+_INCLUDE_VERIF_RE = re.compile(r'^(?=[^\n]*`include)(?=[^\n]*(?i:layers-|verification))[^\n]*(?:\n|\Z)', re.MULTILINE)
+_FILE_SECTION_RE = re.compile(r'^[^\n]*FILE "(?:verification/|layers-)[^\n]*(?:\n(?![^\S\n]*(?:\n|\Z))[^\n]*)*(?:\n[^\S\n]*)?(?:\n|\Z)', re.MULTILINE)
+_IFNDEF_LAYERS_RE = re.compile(r'`ifndef\s+layers_[^\n]+\n\s*`define[^\n]+\n\s*`endif[^\n]*\n')
+_IFNDEF_EMPTY_RE = re.compile(r'`ifndef\s+\w+\s*\n\s*`define\s+\w+\s*\n\s*`endif[^\n]*\n')
+_IFDEF_INITIAL_RE = re.compile(r'`ifdef\s+ENABLE_INITIAL_REG_')
+_IFNDEF_INITIAL_RE = re.compile(r'`ifndef\s+ENABLE_INITIAL_REG_')
+_ENDIF_INITIAL_RE = re.compile(r'`endif.*ENABLE_INITIAL_REG_')
+_IFDEF_ANY_RE = re.compile(r'`(?:ifdef|ifndef)\b')
+_ENDIF_RE = re.compile(r'`endif\b')
+# Top module / entity detection (bytes patterns, run over an mmap of the file)
+_MODULE_RE = re.compile(rb'\bmodule\s+(\w+)\s*(?:\(|#)', re.MULTILINE)
+_SKIP_KEYWORDS = ('verification', 'assert', 'assume', 'cover', 'layer')
+# Word following 'entity' on the same line; the lookahead keeps "entity entity X" yielding both
+_ENTITY_RE = re.compile(rb'\bentity\b(?=[ \t]*(\w+))', re.IGNORECASE)
+# Yosys output parsing
+_NUM_CELLS_RE = re.compile(r'^[^\S\n]*Number of cells:\s*(\d+)', re.MULTILINE)
+# Failure analysis over YOSYS_LOG: one section per processed file, then its stderr
+_SECTION_RE = re.compile(r'=== Processing (.*?) ===(.*?)(?=\n=== Processing|\Z)', re.DOTALL)
+_STDERR_RE = re.compile(r'Yosys stderr:\n(.*?)(?=\n===|\Z)', re.DOTALL)
+# Failure categories of a stderr blob, in priority order: (label, substrings that must all occur).
+# (substring tests: far cheaper than a regex scanning the whole blob per category)
+_ERROR_CATEGORIES = (
+    ('automatic keyword', ('TOK_AUTOMATIC',)),
+    ('missing include', ("Can't open include file",)),
+    ('unpacked arrays', ('syntax error', "unexpected '['")),
+    ('other syntax errors', ('syntax error',)),
+)
+
+# Map exponent/mantissa to FP type
+_FP_MAP = {
+    ('5', '10'): 'FP16',
+    ('8', '23'): 'FP32',
+    ('8', '24'): 'FP32',  # Handle HardFloat format
+    ('11', '52'): 'FP64',
+    ('11', '53'): 'FP64'  # Handle new HardFloat FP64 format
+}
 
 @lru_cache(maxsize=CACHE_SIZE)
 def prettify_name(filename: str) -> str:
@@ -42,144 +157,163 @@ def prettify_name(filename: str) -> str:
     if name.startswith('FLOPCO_FP'):
         return name  # Return the name as is, preserving FLOPCO_FP and everything after
     
-    # Map exponent/mantissa to FP type
-    fp_map = {
-        ('5', '10'): 'FP16',
-        ('8', '23'): 'FP32',
-        ('8', '24'): 'FP32',  # Handle HardFloat format
-        ('11', '52'): 'FP64',
-        ('11', '53'): 'FP64'  # Handle new HardFloat FP64 format
-    }
-
-    # Handle CFG naming pattern (e.g., CFG_FP_add_16_1.sv -> CFGadd_FP16)
-    cfg_match = re.match(r'CFG_FP_(\w+)_(\d+)_(\d+)', name)
-    if cfg_match:
-        op, bits, _ = cfg_match.groups()
-        if bits == '16':
-            return f"CFG{op}_FP16"
-        elif bits == '32':
-            return f"CFG{op}_FP32"
-        elif bits == '64':
-            return f"CFG{op}_FP64"
-
-    # Handle HardFloat naming pattern (e.g., FPADD_8_24 -> HardFloatADD_FP32)
-    hardfloat_match = re.match(r'FP(\w+)_(\d+)_(\d+)', name)
-    if hardfloat_match:
-        op, e, m = hardfloat_match.groups()
-        fp = fp_map.get((e, m), f"e{e}_m{m}")
-        return f"HardFloat{op}_{fp}"
-
-    # Handle OpenFloat naming pattern (e.g., FP_add_32_1 -> OpenFloatAdd_FP32)
-    openfloat_match = re.match(r'FP_(\w+)_(\d+)_(\d+)', name)
-    if openfloat_match:
-        op, bits, _ = openfloat_match.groups()
-        if bits == '16':
-            return f"OpenFloat{op}_FP16"
-        elif bits == '32':
-            return f"OpenFloat{op}_FP32"
-        elif bits == '64':
-            return f"OpenFloat{op}_FP64"
+    # Cheap prefix checks first; every pattern below is anchored at the start of the name
+    if name.startswith('CFG_FP_'):
+        # Handle CFG naming pattern (e.g., CFG_FP_add_16_1.sv -> CFGadd_FP16)
+        cfg_match = _CFG_RE.match(name)
+        if cfg_match:
+            op, bits, _ = cfg_match.groups()
+            if bits == '16':
+                return f"CFG{op}_FP16"
+            elif bits == '32':
+                return f"CFG{op}_FP32"
+            elif bits == '64':
+                return f"CFG{op}_FP64"
+
+    elif name.startswith('FP'):
+        # Handle HardFloat naming pattern (e.g., FPADD_8_24 -> HardFloatADD_FP32)
+        hardfloat_match = _HARDFLOAT_RE.match(name)
+        if hardfloat_match:
+            op, e, m = hardfloat_match.groups()
+            fp = _FP_MAP.get((e, m), f"e{e}_m{m}")
+            return f"HardFloat{op}_{fp}"
+
+        # Handle OpenFloat naming pattern (e.g., FP_add_32_1 -> OpenFloatAdd_FP32)
+        openfloat_match = _OPENFLOAT_RE.match(name)
+        if openfloat_match:
+            op, bits, _ = openfloat_match.groups()
+            if bits == '16':
+                return f"OpenFloat{op}_FP16"
+            elif bits == '32':
+                return f"OpenFloat{op}_FP32"
+            elif bits == '64':
+                return f"OpenFloat{op}_FP64"
+        
+        # Handle OpenFloat divider/sqrt pattern (e.g., FP_divider_32_15_15 -> OpenFloatDiv_FP32)
+        openfloat_div_match = _OPENFLOAT_DIV_RE.match(name)
+        if openfloat_div_match:
+            op, bits, _, _ = openfloat_div_match.groups()
+            if bits == '16':
+                return f"OpenFloat{op}_FP16"
+            elif bits == '32':
+                return f"OpenFloat{op}_FP32"
+            elif bits == '64':
+                return f"OpenFloat{op}_FP64"
+
+    elif name.startswith('Rial'):
+        # Handle Rial naming pattern (e.g., RialAddFP16 -> RialAdd_FP16)
+        rial_match = _RIAL_RE.match(name)
+        if rial_match:
+            op, fp = rial_match.groups()
+            return f"Rial{op}_{fp}"
+
+        # Custom replacements for composite names
+        name = name.replace('ReciprocalATan2Phase1ATan2Phase2', 'Atan2')
+        name = name.replace('SqrtACosPhase1ACosPhase2', 'Acos')
+        
+        # Try to match the main pattern
+        m = _RIAL_EM_RE.match(name)
+        if m:
+            base, _, e, m_ = m.groups()
+            fp = _FP_MAP.get((e, m_), f"e{e}_m{m_}")
+            return f"{base}_{fp}"
+        
+        # Try to match composite/phase pattern
+        m = _RIAL_PHASE_RE.match(name)
+        if m:
+            base, _, e, m_ = m.groups()
+            fp = _FP_MAP.get((e, m_), f"e{e}_m{m_}")
+            return f"{base}_{fp}"
     
-    # Handle OpenFloat divider/sqrt pattern (e.g., FP_divider_32_15_15 -> OpenFloatDiv_FP32)
-    openfloat_div_match = re.match(r'FP_(\w+)_(\d+)_(\d+)_(\d+)', name)
-    if openfloat_div_match:
-        op, bits, _, _ = openfloat_div_match.groups()
-        if bits == '16':
-            return f"OpenFloat{op}_FP16"
-        elif bits == '32':
-            return f"OpenFloat{op}_FP32"
-        elif bits == '64':
-            return f"OpenFloat{op}_FP64"
-
-    # Handle Rial naming pattern (e.g., RialAddFP16 -> RialAdd_FP16)
-    rial_match = re.match(r'Rial(\w+)(FP\d+)', name)
-    if rial_match:
-        op, fp = rial_match.groups()
-        return f"Rial{op}_{fp}"
-
-    # Custom replacements for composite names
+    # Fallback: just return the name without extension (with the composite replacements)
     name = name.replace('ReciprocalATan2Phase1ATan2Phase2', 'Atan2')
     name = name.replace('SqrtACosPhase1ACosPhase2', 'Acos')
-    
-    # Try to match the main pattern
-    m = re.match(r'(Rial\w+)(_e(\d+)_m(\d+)_s\d+)', name)
-    if m:
-        base, _, e, m_ = m.groups()
-        fp = fp_map.get((e, m_), f"e{e}_m{m_}")
-        return f"{base}_{fp}"
-    
-    # Try to match composite/phase pattern
-    m = re.match(r'(Rial\w+Phase1\w+Phase2\w+)(_e(\d+)_m(\d+)_s\d+)', name)
-    if m:
-        base, _, e, m_ = m.groups()
-        fp = fp_map.get((e, m_), f"e{e}_m{m_}")
-        return f"{base}_{fp}"
-    
-    # Fallback: just return the name without extension
     return name
 
 def _hoist_logic_from_always(content: str) -> str:
     """Hoist 'logic x = e;' inside always blocks to module-level 'wire x = e;'."""
-    lines = content.split('\n')
-    out = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        # Start of always block: "always @(...) begin"
-        m = re.match(r'^(\s*)always\s+@\s*\([^)]+\)\s+begin\b', line)
-        if m:
-            indent = m.group(1)
-            always_start = len(out)
-            out.append(line)
-            i += 1
-            depth = 1
+    if 'always' not in content or 'logic' not in content:
+        return content
+    # Single forward scan over token offsets; edits are (start, stop, replacement)
+    # slices, spliced in one join at the end.
+    edits = []
+    depth = 0
+    always_start = 0
+    indent = ''
+    hoisted = []
+    removed = []
+    pos = 0
+    while True:
+        if depth == 0:
+            # Outside always blocks only "always" lines and comments matter, so hop
+            # between candidates with str.find instead of tokenizing every begin/end
+            a = content.find('always', pos)
+            if a == -1:
+                break
+            # Leftmost comment opener before it wins, as in _HOIST_TOKEN_RE
+            # (so "//*" is a line comment, not the start of a block comment)
+            lc = content.find('//', pos, a)
+            c = content.find('/*', pos, a if lc == -1 else lc)
+            if c != -1:
+                # (an unterminated '/*' is not a comment, as for _HOIST_TOKEN_RE)
+                close = content.find('*/', c + 2)
+                pos = c + 2 if close == -1 else close + 2
+                continue
+            if lc != -1:
+                # Line comment: skip the rest of that line
+                nl = content.find('\n', lc)
+                pos = len(content) if nl == -1 else nl + 1
+                continue
+            line_start = content.rfind('\n', 0, a) + 1
+            m = _ALWAYS_RE.match(content, line_start) if line_start >= pos else None
+            if not m:
+                pos = a + 6
+                continue
+            # Start of always block: "always @(...) begin"
+            always_start = line_start
+            indent = m.group('indent')
             hoisted = []
-            while i < len(lines) and depth > 0:
-                cur = lines[i]
-                rest = cur.split('//')[0]
-                if re.search(r'\bbegin\b', rest):
-                    depth += 1
-                if re.search(r'\bend\b', rest) and not re.search(r'\bend(endmodule|function|case|task|primitive|generate)\b', rest):
-                    depth -= 1
-                    if depth == 0:
-                        # End of this always: insert hoisted wires before the block (source order)
-                        for idx, w in enumerate(hoisted):
-                            out.insert(always_start + idx, w)
-                        out.append(cur)
-                        i += 1
-                        continue
-                    # nested end
-                    out.append(cur)
-                    i += 1
-                    continue
-                # Inside always: look for "logic [N:M] name =" or "logic name ="
-                logic_m = re.match(r'^(\s*)logic\s+(\[[^\]]+\]\s+)?(\w+)\s*=\s*(.*)$', cur)
-                if logic_m and depth >= 1:
-                    decl_indent, typ, name, rhs = logic_m.group(1), logic_m.group(2) or '', logic_m.group(3), logic_m.group(4)
-                    stmt = [cur]
-                    j = i + 1
-                    while ';' not in rhs and j < len(lines):
-                        stmt.append(lines[j])
-                        rhs += '\n' + lines[j]
-                        j += 1
-                    full = '\n'.join(stmt)
-                    # Extract RHS: from first '=' to last ';'
-                    eq = full.find('=')
-                    semi = full.rfind(';')
-                    if eq != -1 and semi != -1:
-                        rhs = full[eq + 1:semi].strip()
-                        # Collapse newlines so Yosys gets a single-line wire
-                        rhs = ' '.join(rhs.split())
-                        wire = f"{indent}wire {typ}{name} = {rhs};"
-                        hoisted.append(wire)
-                    i = j
-                    continue
-                out.append(cur)
-                i += 1
+            removed = []
+            depth = 1
+            pos = m.end()
             continue
-        out.append(line)
-        i += 1
-    return '\n'.join(out)
+        m = _HOIST_TOKEN_RE.search(content, pos)
+        if not m:
+            break
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == 'always':
+            depth += 1
+        elif kind == 'begin':
+            depth += 1
+        elif kind == 'end':
+            depth -= 1
+            if depth == 0 and hoisted:
+                # End of this always: insert hoisted wires before the block (source order)
+                edits.append((always_start, always_start, '\n'.join(hoisted) + '\n'))
+                edits.extend(removed)
+        elif kind == 'decl':
+            # Inside always: "logic [N:M] name = ...;" (RHS may span lines)
+            semi = content.find(';', m.end())
+            if semi == -1:
+                continue
+            # Collapse newlines so Yosys gets a single-line wire
+            rhs = ' '.join(content[m.end():semi].split())
+            hoisted.append(f"{indent}wire {m.group('typ') or ''}{m.group('name')} = {rhs};")
+            # Drop the statement lines, through the end of the line holding ';'
+            stmt_end = content.find('\n', semi)
+            pos = len(content) if stmt_end == -1 else stmt_end + 1
+            removed.append((m.start(), pos, ''))
+    if not edits:
+        return content
+    out = []
+    prev = 0
+    for start, stop, text in edits:
+        out.append(content[prev:start])
+        out.append(text)
+        prev = stop
+    out.append(content[prev:])
+    return ''.join(out)
 
 def preprocess_sv_file(filename: str) -> str:
     """Preprocess SystemVerilog file to remove features Yosys doesn't support."""
@@ -187,92 +321,57 @@ def preprocess_sv_file(filename: str) -> str:
         with open(filename, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Remove 'automatic' keyword (Yosys doesn't support it)
-        # Process line by line to handle indentation properly
-        lines = content.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            # Remove "automatic" keyword - handle various patterns:
-            # "      automatic logic [8:0] var ="
-            # "automatic logic var"
-            # etc.
-            # First try to match "automatic" followed by a type keyword
-            cleaned_line = re.sub(r'\bautomatic\s+(logic|reg|wire|integer|real|time|int|bit|byte|shortint|longint|shortreal|string|chandle|event|struct|union|enum|class|interface|modport|package|program|task|function)\s+', r'\1 ', line)
-            # Then remove any remaining "automatic " (catch-all)
-            cleaned_line = re.sub(r'\bautomatic\s+', '', cleaned_line)
-            cleaned_lines.append(cleaned_line)
-        content = '\n'.join(cleaned_lines)
-        
-        # Remove include statements for verification files (handle leading whitespace)
-        # Handle formats like:
+        # Each pass is gated on a cheap substring test so files without the
+        # construct skip the regex/line work entirely.
+        
+        # Remove 'automatic' keyword (Yosys doesn't support it), e.g.
+        # "      automatic logic [8:0] var =" -> "      logic [8:0] var ="
+        if 'automatic' in content:
+            content = _AUTOMATIC_RE.sub('', content)
+        
+        # Remove include lines for verification/layers files (any leading whitespace
+        # or trailing comment), e.g.
         #   `include "layers-XXX-Verification.sv"
-        #     `include "layers-XXX-Verification.sv" // comment (with leading spaces/tabs)
-        #   `include "layers-XXX-Verification.sv"    /* comment */
-        lines = content.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            # Check if line contains an include for verification/layers
-            # Handle leading whitespace before backtick
-            if '`include' in line:
-                # Check if it's a verification/layers include (case insensitive)
-                line_lower = line.lower()
-                if 'layers-' in line_lower or 'verification' in line_lower:
-                    # Skip this entire line
-                    continue
-            cleaned_lines.append(line)
-        content = '\n'.join(cleaned_lines)
-        
-        # Final regex pass to catch any remaining includes (handles edge cases)
-        # Match includes with optional leading whitespace
-        content = re.sub(r'[^\S\n]*`include\s+["\'][^"\']*layers-[^"\']*["\'][^\n]*\n?', '', content)
-        content = re.sub(r'[^\S\n]*`include\s+["\'][^"\']*verification[^"\']*["\'][^\n]*\n?', '', content, flags=re.IGNORECASE)
-        
-        # Remove verification-related sections (everything after "FILE" markers)
-        # Split by FILE markers and keep only the first module
-        lines = content.split('\n')
-        cleaned_lines = []
-        skip_verification = False
-        for line in lines:
-            if 'FILE "verification/' in line or 'FILE "layers-' in line:
-                skip_verification = True
-            if not skip_verification:
-                cleaned_lines.append(line)
-            elif line.strip() == '' and skip_verification:
-                # Stop skipping after empty line (end of verification section)
-                skip_verification = False
-        
-        content = '\n'.join(cleaned_lines)
-        
-        # Remove ifndef/define/endif blocks for verification
-        content = re.sub(r'`ifndef\s+layers_[^\n]+\n\s*`define[^\n]+\n\s*`endif[^\n]*\n', '', content)
-        
-        # Remove empty ifndef/endif blocks
-        content = re.sub(r'`ifndef\s+\w+\s*\n\s*`define\s+\w+\s*\n\s*`endif[^\n]*\n', '', content)
+        #     `include "layers-XXX-Verification.sv" // comment
+        if '`include' in content:
+            content = _INCLUDE_VERIF_RE.sub('', content)
+        
+        # Remove verification-related sections: from a FILE marker line up to and
+        # including the next empty line
+        if 'FILE "' in content:
+            content = _FILE_SECTION_RE.sub('', content)
+        
+        if '`ifndef' in content:
+            # Remove ifndef/define/endif blocks for verification
+            content = _IFNDEF_LAYERS_RE.sub('', content)
+            # Remove empty ifndef/endif blocks
+            content = _IFNDEF_EMPTY_RE.sub('', content)
         
         # Remove ENABLE_INITIAL_REG_ / initial blocks (Yosys "invalid nesting" with
         # initial + for(logic...) + automatic logic). Not needed for area-only synthesis.
-        lines = content.split('\n')
-        cleaned = []
-        skip_depth = 0
-        for line in lines:
-            if 'ENABLE_INITIAL_REG_' in line:
-                if re.search(r'`ifdef\s+ENABLE_INITIAL_REG_', line):
-                    skip_depth += 1
-                    continue
-                if re.search(r'`ifndef\s+ENABLE_INITIAL_REG_', line):
-                    skip_depth = 1
-                    continue
-                if re.search(r'`endif.*ENABLE_INITIAL_REG_', line):
-                    skip_depth -= 1
+        if 'ENABLE_INITIAL_REG_' in content:
+            lines = content.split('\n')
+            cleaned = []
+            skip_depth = 0
+            for line in lines:
+                if 'ENABLE_INITIAL_REG_' in line:
+                    if _IFDEF_INITIAL_RE.search(line):
+                        skip_depth += 1
+                        continue
+                    if _IFNDEF_INITIAL_RE.search(line):
+                        skip_depth = 1
+                        continue
+                    if _ENDIF_INITIAL_RE.search(line):
+                        skip_depth -= 1
+                        continue
+                if skip_depth > 0:
+                    if _IFDEF_ANY_RE.search(line):
+                        skip_depth += 1
+                    elif _ENDIF_RE.search(line):
+                        skip_depth -= 1
                     continue
-            if skip_depth > 0:
-                if re.search(r'`(?:ifdef|ifndef)\b', line):
-                    skip_depth += 1
-                elif re.search(r'`endif\b', line):
-                    skip_depth -= 1
-                continue
-            cleaned.append(line)
-        content = '\n'.join(cleaned)
+                cleaned.append(line)
+            content = '\n'.join(cleaned)
         
         # Hoist "logic x = e;" from inside always blocks to module-level "wire x = e;"
         # (Yosys "invalid nesting" otherwise.)
@@ -280,7 +379,8 @@ def preprocess_sv_file(filename: str) -> str:
         
         # Fix OP_CAST / unpacked array literal: Yosys errors on "'{ ... }" (SV array
         # assignment pattern). Rewrite as concatenation "{ ... }".
-        content = content.replace("'{", "{")
+        if "'{" in content:
+            content = content.replace("'{", "{")
         
         return content
     except Exception as e:
@@ -289,27 +389,43 @@ def preprocess_sv_file(filename: str) -> str:
         logger.debug(f"Preprocessing traceback: {traceback.format_exc()}")
         return None
 
+def _classify_stderr(stderr: str) -> Optional[str]:
+    """Return the first _ERROR_CATEGORIES label whose substrings all occur in stderr, or None."""
+    for label, tokens in _ERROR_CATEGORIES:
+        for token in tokens:
+            if token not in stderr:
+                break
+        else:
+            return label
+    return None
+
+@contextmanager
+def _mapped_file(filename: str):
+    """Read-only mmap of a file for scanning without a Python-side copy (b'' if empty)."""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
 def get_top_module(filename: str) -> str:
     """Get the top module name for a SystemVerilog file."""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
         base = os.path.splitext(os.path.basename(filename))[0]
-        module_pattern = re.compile(r'\bmodule\s+(\w+)\s*(?:\(|#)', re.MULTILINE)
-        candidates = []
-        for m in module_pattern.finditer(content):
-            name = m.group(1)
-            if any(skip in name.lower() for skip in ['verification', 'assert', 'assume', 'cover', 'layer']):
-                continue
-            candidates.append(name)
-        if not candidates:
-            return base
-        # Prefer module matching filename (e.g. FP_mult_32_1.sv -> FP_mult_32_1)
-        for c in candidates:
-            if c == base:
-                return c
+        last = None
+        with _mapped_file(filename) as content:
+            for m in _MODULE_RE.finditer(content):
+                name = m.group(1).decode('ascii')
+                lname = name.lower()
+                if any(skip in lname for skip in _SKIP_KEYWORDS):
+                    continue
+                # Prefer module matching filename (e.g. FP_mult_32_1.sv -> FP_mult_32_1)
+                if name == base:
+                    return name
+                last = name
         # Else use last module (Chisel often emits submodules first, top last)
-        return candidates[-1]
+        return last or base
     except Exception as e:
         logger.debug(f"Error reading {filename} for module name: {e}")
         return os.path.splitext(os.path.basename(filename))[0]
@@ -317,31 +433,17 @@ def get_top_module(filename: str) -> str:
 def get_top_entity(filename: str) -> str:
     """Get the top entity name for a VHDL file."""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Find all entity declarations
+        with _mapped_file(filename) as content:
+            # Find all entity declarations; the last one is the top
             last_entity_word = None
-            lines = content.splitlines()
-            
-            for line in lines:
-                # Case-insensitive search for whole word 'entity'
-                if re.search(r'\bentity\b', line, re.IGNORECASE):
-                    # Find the last 'entity' in this line
-                    match = re.finditer(r'\bentity\b', line, re.IGNORECASE)
-                    for m in match:
-                        start_idx = m.end()
-                        # Extract the rest of the line after 'entity'
-                        rest_of_line = line[start_idx:].strip()
-                        # Find the next word (sequence of non-whitespace characters)
-                        next_word_match = re.match(r'\s*(\w+)', rest_of_line)
-                        if next_word_match:
-                            last_entity_word = next_word_match.group(1)
-            
-            if last_entity_word:
-                logger.info(f"Found top entity {last_entity_word} in {filename}")
-                return last_entity_word
-            else:
-                logger.error(f"No entity declaration found in {filename}")
+            for m in _ENTITY_RE.finditer(content):
+                last_entity_word = m.group(1)
+        if last_entity_word:
+            last_entity_word = last_entity_word.decode('ascii')
+            logger.info(f"Found top entity {last_entity_word} in {filename}")
+            return last_entity_word
+        else:
+            logger.error(f"No entity declaration found in {filename}")
     except Exception as e:
         logger.error(f"Error reading {filename}: {e}")
     return None
@@ -364,37 +466,256 @@ def setup_logging():
     
     return logger
 
-def sum_cell_counts(text: str) -> int:
-    """Parse cell counts from Yosys output."""
-    # Split the text into lines
-    lines = text.strip().split('\n')
-    
-    # Find the last occurrence of "Printing statistics."
-    last_stats_index = -1
-    for i, line in enumerate(lines):
-        if "Printing statistics." in line:
-            last_stats_index = i
-    
-    # If "Printing statistics." not found, return 0
-    if last_stats_index == -1:
-        return 0
-    
-    # Initialize sum of cell counts
-    total_cells = 0
-    
-    # Process lines after the last "Printing statistics."
-    for line in lines[last_stats_index:]:
-        # Match "Number of cells: <number>"
-        match = re.match(r'\s*Number of cells:\s*(\d+)', line)
-        if match:
-            total_cells += int(match.group(1))
-    
-    return total_cells
+def sum_cell_counts(lines: Iterable[str]) -> int:
+    """Parse cell counts from Yosys output, consumed line by line."""
+    # Only the output after the last "Printing statistics." counts
+    cells = None
+    for line in lines:
+        if 'Printing statistics.' in line:
+            cells = 0
+        elif cells is not None:
+            m = _NUM_CELLS_RE.match(line)
+            if m:
+                cells += int(m.group(1))
+    return cells or 0
+
+def read_stat_json(stat_file: str, top: str) -> Tuple[int, int]:
+    """Read (wire_bits, cells) from a Yosys 'stat -json' dump; (0, 0) if missing."""
+    try:
+        with open(stat_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return (0, 0)
+    # "design" holds the totals over the hierarchy below top; fall back to the top module
+    stats = data.get('design')
+    if not stats:
+        modules = data.get('modules', {})
+        stats = modules.get(top) or modules.get('\\' + top) or {}
+    return (int(stats.get('num_wire_bits', 0)), int(stats.get('num_cells', 0)))
+
+def _log_shard_path(pid) -> str:
+    """Per-worker Yosys log shard next to YOSYS_LOG (pid may be '*' for globbing)."""
+    return f"{os.path.splitext(YOSYS_LOG)[0]}.{pid}.log"
+
+def _log_shards() -> List[str]:
+    """Existing worker log shards, sorted (only numeric PID names, not e.g. yosys_output.old.log)."""
+    return sorted(shard for shard in glob.glob(_log_shard_path('*'))
+                  if shard.rsplit('.', 2)[-2].isdigit())
+
+def remove_log_shards() -> None:
+    """Remove worker log shards left over from an interrupted run."""
+    for shard in _log_shards():
+        try:
+            os.remove(shard)
+        except OSError as e:
+            logger.warning(f"Could not remove log shard {shard}: {e}")
+
+def merge_log_shards() -> None:
+    """Append all worker log shards to YOSYS_LOG and remove them."""
+    with open(YOSYS_LOG, 'a', encoding='utf-8', buffering=LOG_BUFFER_SIZE) as out:
+        for shard in _log_shards():
+            try:
+                with open(shard, 'r', encoding='utf-8') as f:
+                    out.write(f.read())
+                os.remove(shard)
+            except OSError as e:
+                logger.warning(f"Could not merge log shard {shard}: {e}")
+
+def _cache_key(source: bytes, script: str, *extra: str) -> str:
+    """Cache key for a Yosys run: hash of the input content, Yosys version, script and any extra parts."""
+    h = hashlib.blake2b(source, digest_size=16)
+    for part in (CONFIG['yosys_version'], script, *extra):
+        h.update(b'\0')
+        h.update(part.encode('utf-8'))
+    return h.hexdigest()
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+def cache_lookup(key: str) -> Optional[Tuple[int, int]]:
+    """Return cached (wire_bits, cells) for a key, or None."""
+    try:
+        with open(_cache_path(key), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        return (int(entry['wire_bits']), int(entry['cells']))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def cache_store(key: str, wire_bits: int, cells: int) -> None:
+    """Store a result in the cache (atomically, via temp file + rename)."""
+    path = _cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'wire_bits': wire_bits, 'cells': cells, 'yosys_ver': CONFIG['yosys_version']}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write cache entry {path}: {e}")
+
+def _yosys_env() -> Dict[str, str]:
+    """Environment for Yosys subprocesses: single-threaded, since parallelism comes from the pool."""
+    env = os.environ.copy()
+    env['YOSYS_MAX_THREADS'] = '1'
+    env.setdefault('OMP_NUM_THREADS', '1')
+    return env
+
+def _tee_lines(lines: Iterable[str], f: TextIO) -> Iterator[str]:
+    """Yield lines unchanged while writing each one to f."""
+    for line in lines:
+        f.write(line)
+        yield line
+
+def _run_yosys_streaming(cmd: List[str], log_f: TextIO, timeout: int = TIMEOUT) -> Tuple[subprocess.CompletedProcess, int]:
+    """Run a Yosys command line, streaming stdout into log_f and counting cells as it arrives.
+
+    Returns the process result (stdout=None, since it was never buffered) and the cell count.
+    """
+    with tempfile.TemporaryFile('w+', encoding='utf-8', dir=TMP_DIR) as err:
+        proc = subprocess.Popen(cmd,
+                                stdout=subprocess.PIPE,
+                                stderr=err,
+                                encoding='utf8',
+                                env=_yosys_env())
+        # Line iteration blocks, so enforce the timeout by killing the process from a timer.
+        # The flag is set before the kill (Timer.finished is only set after the callback
+        # returns, so it can still be clear when the EOF from the kill wakes this thread)
+        timed_out = threading.Event()
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+        watchdog = threading.Timer(timeout, kill_on_timeout)
+        watchdog.start()
+        try:
+            cells = sum_cell_counts(_tee_lines(proc.stdout, log_f))
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        err.seek(0)
+        return subprocess.CompletedProcess(cmd, returncode, None, err.read()), cells
+
+class YosysWorker:
+    """Long-lived interactive Yosys process, fed one script per file over stdin.
+
+    Each script starts with `design -reset` / `design -reset-vlog` and ends with a `log`
+    sentinel; stdout is read up to the sentinel. If Yosys exits (read_verilog errors are
+    fatal) or times out, the process is dropped and a fresh one is started for the next
+    script. Other command errors (e.g. in hierarchy or proc) don't stop the shell, which
+    runs the rest of the script on the partial design, so any ERROR: line marks the run
+    as failed.
+    """
+
+    def __init__(self):
+        self.proc: Optional[subprocess.Popen] = None
+        self.stderr_file = None
+        self.stderr_pos = 0
+        self.seq = 0
+
+    def _start(self) -> None:
+        # stderr goes to a temp file (read back per script) so it can never fill a pipe and block Yosys
+        self.stderr_file = tempfile.TemporaryFile('w+b', dir=TMP_DIR)
+        self.stderr_pos = 0
+        self.proc = subprocess.Popen(YOSYS_SHELL_CMD,
+                                     stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE,
+                                     stderr=self.stderr_file,
+                                     env=_yosys_env())
+
+    def close(self) -> None:
+        """Stop the Yosys process (if running) and release its stderr file."""
+        if self.proc is not None:
+            if self.proc.poll() is None:
+                self.proc.kill()
+            self.proc.wait()
+            self.proc.stdin.close()
+            self.proc.stdout.close()
+            self.proc = None
+        if self.stderr_file is not None:
+            self.stderr_file.close()
+            self.stderr_file = None
+
+    def run(self, script: str, timeout: int = TIMEOUT, reset: bool = True) -> subprocess.CompletedProcess:
+        """Run a script in the persistent process; returncode is 0 once the sentinel is seen.
+
+        With reset=False the script continues on the design left by the previous one.
+        """
+        if self.proc is None or self.proc.poll() is not None:
+            self.close()
+            self._start()
+        self.seq += 1
+        sentinel = f"===END {os.getpid()}-{self.seq}==="
+        # The interactive shell echoes each command ("yosys> log ..."), so the command spells
+        # the sentinel with a double space: `log` re-joins its arguments with single spaces,
+        # so only its output contains the exact marker
+        marker = (sentinel + "\n").encode('utf-8')
+        command = "log " + sentinel.replace(" ", "  ")
+        # design -reset-vlog: also forget `define macros and top-level declarations from
+        # files read earlier, so results don't depend on what this worker ran before
+        prefix = "design -reset\ndesign -reset-vlog\n" if reset else ""
+        self.proc.stdin.write(f"{prefix}{script}{command}\n".encode('utf-8'))
+        self.proc.stdin.flush()
+
+        fd = self.proc.stdout.fileno()
+        deadline = time.monotonic() + timeout
+        out = bytearray()
+        returncode = 0
+        exited = False
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise subprocess.TimeoutExpired(YOSYS_SHELL_CMD, timeout)
+            if not select.select([fd], [], [], remaining)[0]:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                # Yosys exited before reaching the sentinel (e.g. on a fatal ERROR)
+                returncode = self.proc.wait() or 1
+                exited = True
+                break
+            # Only the new tail (plus a marker's overlap) can complete the marker
+            start = max(0, len(out) - len(marker) + 1)
+            out += chunk
+            end = out.find(marker, start)
+            if end != -1:
+                del out[end:]
+                break
+        # Yosys shares the file offset, so read the new tail with pread instead of seek + read
+        err_fd = self.stderr_file.fileno()
+        err_end = os.fstat(err_fd).st_size
+        stderr_output = os.pread(err_fd, err_end - self.stderr_pos, self.stderr_pos).decode('utf-8', errors='replace')
+        self.stderr_pos = err_end
+        if exited:
+            self.close()
+        stdout_output = out.decode('utf-8', errors='replace')
+        if not returncode and ('ERROR:' in stdout_output or 'ERROR:' in stderr_output):
+            # Script mode would have stopped here with a nonzero exit
+            returncode = 1
+        return subprocess.CompletedProcess(YOSYS_SHELL_CMD, returncode, stdout_output, stderr_output)
+
+# One persistent Yosys per pool worker process, started on first use
+_yosys_worker: Optional[YosysWorker] = None
+
+def _run_yosys_sv(script: str, timeout: int = TIMEOUT, reset: bool = True) -> subprocess.CompletedProcess:
+    """Run an SV script in this process's persistent Yosys."""
+    global _yosys_worker
+    if _yosys_worker is None:
+        _yosys_worker = YosysWorker()
+    return _yosys_worker.run(script, timeout, reset)
 
 def yosys(fn: str) -> Tuple[int, int]:
     """Run Yosys analysis on a single file."""
-    temp_file = f"tmp_{os.getpid()}.ys"
+    stat_file = os.path.join(TMP_DIR or os.path.abspath('.'), f"tmp_{os.getpid()}.stat.json")
     preprocessed_file = None
+    cache_key = None
+    preprocessed_key = None
+    read_note = ""
     try:
         # Determine file type and appropriate Yosys commands
         if fn.endswith('.vhdl'):
@@ -404,78 +725,88 @@ def yosys(fn: str) -> Tuple[int, int]:
                 logger.error(f"Could not find top entity in {fn}")
                 return (0, 0)
             yosyscmd = f"ghdl --std=08 -fsynopsys {fn} -e {top}; synth; stat"
+            cache_script = yosyscmd
             logger.info(f"Processing VHDL file: {fn} with top entity: {top}")
         else:
-            # For SystemVerilog files - try preprocessing first, but fallback to direct read
             # Get actual module name from file (not filename-based, since they don't match)
             top = get_top_module(fn)
-            
-            # Try preprocessing to remove problematic SystemVerilog features
-            preprocessed_content = preprocess_sv_file(fn)
-            if preprocessed_content is None:
-                logger.warning(f"Preprocessing failed for {fn}, using original file (may have Yosys compatibility issues)")
-            if preprocessed_content is not None:
-                # Write preprocessed content to temporary file
-                preprocessed_file = f"tmp_{os.getpid()}_{os.path.basename(fn)}"
-                with open(preprocessed_file, 'w', encoding='utf-8') as f:
-                    f.write(preprocessed_content)
-                # Use preprocessed file
-                abs_path = os.path.abspath(preprocessed_file)
-                yosyscmd = f"""read_verilog -sv {abs_path}
-hierarchy -top {top}
-proc
-techmap -map +/techmap.v
-opt_clean
-stat
-"""
-            else:
-                # Fallback: use original file directly (like old script)
-                abs_path = os.path.abspath(fn)
-                yosyscmd = f"""read -sv {abs_path}
-hierarchy -top {top}
-proc
-techmap -map +/techmap.v
-opt_clean
-stat
-"""
+            synth_script = SV_FAST_SYNTH_SCRIPT if CONFIG['fast'] else SV_SYNTH_SCRIPT
+            sv_script = SV_READ_SCRIPT + synth_script
+            yosyscmd = sv_script.format(reader='read_verilog', path=os.path.abspath(fn), top=top, stat_file=stat_file)
+            cache_script = sv_script.format(reader='read_verilog', path='', top=top, stat_file='')
+
+        if CONFIG['use_cache']:
+            with open(fn, 'rb') as f:
+                source = f.read()
+            cache_key = _cache_key(source, cache_script)
+            cached = cache_lookup(cache_key)
+            if cached is None and not fn.endswith('.vhdl'):
+                # Files that needed the preprocessed fallback are stored under its version too
+                preprocessed_key = _cache_key(source, cache_script, PREPROCESS_VERSION)
+                cached = cache_lookup(preprocessed_key)
+            if cached is not None:
+                logger.debug(f"Cache hit for {fn}: {cached}")
+                return cached
 
-        with open(temp_file, 'w') as f:
-            f.write(yosyscmd)
-        
         try:
             # Run Yosys with appropriate command based on file type
             # Capture both stdout and stderr to see what's going wrong
             if fn.endswith('.vhdl'):
-                result = subprocess.run(['yosys', '-m', 'ghdl', '-p', yosyscmd],
-                                       encoding='utf8',
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE,
-                                       timeout=TIMEOUT)
-                p = result.stdout
-                stderr_output = result.stderr
+                # Stream stdout straight into the log shard instead of buffering it
+                with open(_log_shard_path(os.getpid()), 'a', encoding='utf-8', buffering=LOG_BUFFER_SIZE) as f:
+                    f.write(''.join([f"\n=== Processing {fn} ===\n", f"Top module: {top}\n",
+                                     f"Yosys commands:\n{yosyscmd}\n", "Yosys stdout:\n"]))
+                    result, vhdl_cells = _run_yosys_streaming(['yosys', '-m', 'ghdl', '-p', yosyscmd], f)
+                    f.write(''.join(["\nYosys stderr:\n", result.stderr, "\n"]))
             else:
-                result = subprocess.run(['yosys', temp_file],
-                                       encoding='utf8',
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE,
-                                       timeout=TIMEOUT)
-                p = result.stdout
-                stderr_output = result.stderr
-            
-            # Log Yosys output to file (relative to script location)
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            log_file = os.path.join(script_dir, '..', 'yosys_output.log')
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n=== Processing {fn} ===\n")
-                f.write(f"Top module: {top}\n")
-                if preprocessed_file:
-                    f.write(f"Using preprocessed file: {preprocessed_file}\n")
-                f.write(f"Yosys commands:\n{yosyscmd}\n")
-                f.write("Yosys stdout:\n")
-                f.write(p)
-                f.write("\nYosys stderr:\n")
-                f.write(stderr_output)
-                f.write("\n")
+                # Fast path: many files synthesize as-is, so try reading the original file first
+                # (scripts are fed to this worker's persistent Yosys, no temporary .ys file)
+                read_cmd = SV_READ_SCRIPT.format(reader='read_verilog', path=os.path.abspath(fn), top=top)
+                try:
+                    result = _run_yosys_sv(read_cmd, timeout=DIRECT_READ_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    # Slow to elaborate is not rejected: retry the direct read with the full budget
+                    logger.debug(f"Direct read of {fn} exceeded {DIRECT_READ_TIMEOUT}s, retrying under TIMEOUT")
+                    result = _run_yosys_sv(read_cmd)
+                direct_ok = False
+                if result.returncode == 0:
+                    # Accepted as-is: synthesize the design already loaded in this shell
+                    synth = _run_yosys_sv(synth_script.format(stat_file=stat_file), reset=False)
+                    result = subprocess.CompletedProcess(synth.args, synth.returncode,
+                                                         result.stdout + synth.stdout, result.stderr + synth.stderr)
+                    direct_ok = result.returncode == 0 and os.path.exists(stat_file)
+                if direct_ok:
+                    read_note = "Direct read: ok\n"
+                else:
+                    # Remove SystemVerilog features Yosys rejects and retry
+                    preprocessed_content = preprocess_sv_file(fn)
+                    if preprocessed_content is None:
+                        logger.warning(f"Preprocessing failed for {fn}, keeping direct read result (may have Yosys compatibility issues)")
+                        read_note = "Direct read: failed, preprocessing failed\n"
+                    else:
+                        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=TMP_DIR, delete=False,
+                                                         prefix=f"tmp_{os.getpid()}_", suffix=f"_{os.path.basename(fn)}") as f:
+                            preprocessed_file = f.name
+                            f.write(preprocessed_content)
+                        read_note = f"Direct read: failed, using preprocessed file: {preprocessed_file}\n"
+                        cache_key = preprocessed_key
+                        if os.path.exists(stat_file):
+                            os.remove(stat_file)
+                        yosyscmd = sv_script.format(reader='read_verilog', path=os.path.abspath(preprocessed_file),
+                                                    top=top, stat_file=stat_file)
+                        result = _run_yosys_sv(yosyscmd)
+                if result.returncode != 0 and os.path.exists(stat_file):
+                    # The shell keeps going after a failed command, so `tee ... stat -json`
+                    # may have dumped a partial design: don't count it
+                    os.remove(stat_file)
+
+                # Log Yosys output to this worker's log shard in a single write
+                log_parts = [f"\n=== Processing {fn} ===\n", f"Top module: {top}\n", read_note,
+                             f"Yosys commands:\n{yosyscmd}\n", "Yosys stdout:\n", result.stdout,
+                             "\nYosys stderr:\n", result.stderr, "\n"]
+                with open(_log_shard_path(os.getpid()), 'a', encoding='utf-8', buffering=LOG_BUFFER_SIZE) as f:
+                    f.write(''.join(log_parts))
+            stderr_output = result.stderr
             
             # Check if Yosys failed - but don't exit immediately, try to parse anyway
             # (old script ignored errors and tried to parse)
@@ -501,114 +832,119 @@ stat
         wire_bits = 0
         cells = 0
         if fn.endswith('.vhdl'):
-            cells = sum_cell_counts(p)
+            cells = vhdl_cells
         else:
-            # Yosys 0.61 uses different output format - look for both patterns
-            for line in p.split('\n'):
-                # Try old format "Number of wire bits: 397"
-                if "Number of wire bits:" in line:
-                    try:
-                        wire_bits = int(re.search(r'\d+', line).group())
-                    except (AttributeError, ValueError):
-                        pass
-                # Try new format "      397 wire bits" (Yosys 0.61 - with leading spaces)
-                elif re.search(r'\d+\s+wire bits', line) and not "Number of" in line:
-                    try:
-                        match = re.search(r'(\d+)\s+wire bits', line)
-                        if match:
-                            wire_bits = int(match.group(1))
-                    except (AttributeError, ValueError):
-                        pass
-                # Try old format "Number of cells: 52"
-                elif "Number of cells:" in line:
-                    try:
-                        cells = int(re.search(r'\d+', line).group())
-                    except (AttributeError, ValueError):
-                        pass
-                # Try new format "       52 cells" (Yosys 0.61 - with leading spaces, standalone)
-                elif re.search(r'^\s+\d+\s+cells\s*$', line):
-                    try:
-                        match = re.search(r'(\d+)\s+cells', line)
-                        if match:
-                            cells = int(match.group(1))
-                    except (AttributeError, ValueError):
-                        pass
+            wire_bits, cells = read_stat_json(stat_file, top)
         
         if fn.endswith('.vhdl'):
             logger.info(f"VHDL file {fn} processed: {cells} cells")
+        if cache_key and cells > 0:
+            cache_store(cache_key, wire_bits, cells)
         
         return (wire_bits, cells)
     except Exception as e:
         logger.error(f"Unexpected error processing {fn}: {str(e)}")
         return (0, 0)
     finally:
-        if os.path.exists(temp_file):
+        if os.path.exists(stat_file):
             try:
-                os.remove(temp_file)
+                os.remove(stat_file)
             except OSError as e:
-                logger.warning(f"Could not remove temporary file {temp_file}: {e}")
+                logger.warning(f"Could not remove stat file {stat_file}: {e}")
         if preprocessed_file and os.path.exists(preprocessed_file):
             try:
                 os.remove(preprocessed_file)
             except OSError as e:
                 logger.warning(f"Could not remove preprocessed file {preprocessed_file}: {e}")
 
+def count_direct_reads() -> Tuple[int, int]:
+    """Count (direct, preprocessed) SV reads recorded in YOSYS_LOG."""
+    try:
+        with open(YOSYS_LOG, 'r', encoding='utf-8') as f:
+            log_content = f.read()
+    except OSError:
+        return (0, 0)
+    return (log_content.count("\nDirect read: ok\n"), log_content.count("\nDirect read: failed"))
+
 def estimate_area_nm2(ncells: int, a: int = AREA_PER_CELL) -> float:
     """Estimate total area in nm² for 7nm technology."""
     return ncells * a
 
-def create_xml_report(results: List[Tuple[str, Tuple[int, int]]]) -> None:
-    """Create XML report from analysis results."""
+def create_xml_report(results: List[Tuple[str, Tuple[int, int]]],
+                      pretty_names: Optional[Dict[str, str]] = None) -> None:
+    """Create XML report from analysis results (pretty_names: precomputed prettify_name per file)."""
+    if pretty_names is None:
+        pretty_names = {fn: prettify_name(fn) for fn, _ in results}
     try:
-        # Create the root element
-        root = ET.Element("CellCountReport")
-        
-        # Add timestamp
-        timestamp = ET.SubElement(root, "Timestamp")
-        timestamp.text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Add summary
-        summary = ET.SubElement(root, "Summary")
+        # Assemble the document as a list of strings and join once
         total_cells = sum(cells[1] for _, cells in results)
-        ET.SubElement(summary, "TotalCells").text = str(total_cells)
-        ET.SubElement(summary, "TotalArea_nm2").text = f"{estimate_area_nm2(total_cells):.0f}"
-        ET.SubElement(summary, "AreaPerCell_nm2").text = str(AREA_PER_CELL)
-        ET.SubElement(summary, "TechnologyNode").text = "7nm"
+        parts = [
+            "<?xml version='1.0' encoding='utf-8'?>\n<CellCountReport>",
+            f"<Timestamp>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</Timestamp>",
+            f"<Summary><TotalCells>{total_cells}</TotalCells>"
+            f"<TotalArea_nm2>{estimate_area_nm2(total_cells):.0f}</TotalArea_nm2>"
+            f"<AreaPerCell_nm2>{AREA_PER_CELL}</AreaPerCell_nm2>"
+            "<TechnologyNode>7nm</TechnologyNode></Summary>",
+            "<Modules>",
+        ]
         
         # Add all modules in a single section
-        modules = ET.SubElement(root, "Modules")
         for fn, (nwirebits, ncells) in results:
-            module = ET.SubElement(modules, "Module")
-            ET.SubElement(module, "Name").text = prettify_name(fn)
-            ET.SubElement(module, "WireBits").text = str(nwirebits)
-            ET.SubElement(module, "Cells").text = str(ncells)
-            ET.SubElement(module, "Area_nm2").text = f"{estimate_area_nm2(ncells):.0f}"
+            parts.append(f"<Module><Name>{xml_escape(pretty_names[fn])}</Name>"
+                         f"<WireBits>{nwirebits}</WireBits><Cells>{ncells}</Cells>"
+                         f"<Area_nm2>{estimate_area_nm2(ncells):.0f}</Area_nm2></Module>")
+        parts.append("</Modules></CellCountReport>")
         
-        # Create the XML tree and write to file
+        # Write to file
         # Paths are relative to where script is run from (root directory)
-        tree = ET.ElementTree(root)
         output_file = "generated/cell_count_report.xml"
         os.makedirs("generated", exist_ok=True)
         with open(output_file, "wb") as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+            f.write(''.join(parts).encode('utf-8'))
             
         logger.info(f"XML report generated successfully: {output_file}")
     except Exception as e:
         logger.error(f"Error creating XML report: {str(e)}")
         raise
 
-def process_files(files: List[str]) -> Dict[str, Tuple[int, int]]:
-    """Process files in parallel using ProcessPoolExecutor."""
+def yosys_with_name(fn: str) -> Tuple[str, Tuple[int, int]]:
+    """Run yosys() on a file and tag the result with its name (for unordered results)."""
+    try:
+        return fn, yosys(fn)
+    except Exception as e:
+        logger.error(f"Error processing {fn}: {str(e)}")
+        return fn, (0, 0)
+
+def _worker_init(core_queue, config: Dict) -> None:
+    """Pool initializer: apply main()'s settings and pin this worker (and the Yosys
+    runs it spawns) to its own core."""
+    CONFIG.update(config)
+    if not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        os.sched_setaffinity(0, {core_queue.get(timeout=CORE_QUEUE_TIMEOUT)})
+    except queue.Empty:
+        logger.warning(f"Could not pin worker {os.getpid()} to a core: no core assigned "
+                       f"within {CORE_QUEUE_TIMEOUT}s")
+    except OSError as e:
+        logger.warning(f"Could not pin worker {os.getpid()} to a core: {e}")
+
+def process_files(files: List[str], jobs: int = MAX_WORKERS) -> Dict[str, Tuple[int, int]]:
+    """Process files in parallel using a multiprocessing pool of jobs workers."""
     results = {}
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_file = {executor.submit(yosys, f): f for f in files}
-        for future in as_completed(future_to_file):
-            file = future_to_file[future]
-            try:
-                results[file] = future.result()
-            except Exception as e:
-                logger.error(f"Error processing {file}: {str(e)}")
-                results[file] = (0, 0)
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(multiprocessing.cpu_count()))
+    core_queue = multiprocessing.Queue()
+    for i in range(jobs):
+        core_queue.put(cores[i % len(cores)])
+    # chunksize=1: each task is a Yosys run of seconds to hours, so batching files
+    # per dispatch would only serialize slow files behind each other
+    with multiprocessing.Pool(jobs, initializer=_worker_init, initargs=(core_queue, CONFIG)) as pool:
+        for fn, res in pool.imap_unordered(yosys_with_name, files, chunksize=1):
+            results[fn] = res
+            logger.info(f"[{len(results)}/{len(files)}] {fn}: {res[1]} cells")
     return results
 
 def print_loading_animation():
@@ -620,20 +956,52 @@ def print_loading_animation():
     start_time = time.time()
     
     while True:
-        print("\033[H\033[J")  # Clear screen
-        
         # Calculate elapsed time
         elapsed = time.time() - start_time
         
-        # Print loading circle and elapsed time
-        print(f"Loading {loading_frames[frame]} Time elapsed: {elapsed:.1f} seconds")
+        # Rewrite a single line in place (no screen clear)
+        sys.stderr.write(f"\rLoading {loading_frames[frame]} Time elapsed: {elapsed:.1f} seconds")
+        sys.stderr.flush()
         
         # Update frame
         frame = (frame + 1) % len(loading_frames)
-        time.sleep(0.1)  # Control animation speed
+        time.sleep(0.5)  # Control animation speed
+
+def iter_files(root: str, suffix: str, recursive: bool = False) -> Iterator[str]:
+    """Yield paths of files under root ending in suffix (skipping hidden entries, like glob)."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from iter_files(entry.path, suffix, recursive)
+            elif entry.name.endswith(suffix):
+                yield entry.path if root != "." else entry.name
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run Yosys area estimation and write generated/cell_count_report.xml.")
+    parser.add_argument('pattern', nargs='?',
+                        help="glob pattern of files to process (default: generated/**/*.sv and *.vhdl)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"ignore and do not update the result cache in {CACHE_DIR}")
+    parser.add_argument('--animate', action='store_true',
+                        help="show a spinner with elapsed time while files are processed")
+    parser.add_argument('--fast', action='store_true',
+                        help="skip techmap/opt_clean for SV files (quicker; counts RTL-level cells, not post-mapping gates)")
+    parser.add_argument('-j', '--jobs', type=int, default=MAX_WORKERS,
+                        help=f"number of parallel Yosys workers (default: available CPUs, {MAX_WORKERS})")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
 
 def main():
     """Main function to process files and generate report."""
+    args = parse_args()
+    CONFIG['use_cache'] = not args.no_cache
+    CONFIG['fast'] = args.fast
     try:
         # Check if Yosys is available
         try:
@@ -642,6 +1010,7 @@ def main():
                           stderr=subprocess.PIPE, 
                           timeout=5)
             if result.returncode == 0:
+                CONFIG['yosys_version'] = result.stdout.decode('utf-8', errors='replace').strip()
                 logger.info("Yosys found and ready")
             else:
                 logger.error("Yosys is not working properly. Please check your installation.")
@@ -655,14 +1024,18 @@ def main():
             logger.error(f"Could not verify Yosys installation: {e}")
             sys.exit(1)
         
+        if CONFIG['fast']:
+            logger.info("Fast mode: SV cell counts are RTL-level (no techmap), not comparable with full runs")
+        
         # Clear Yosys log so we only report on this run (was appending across runs)
-        log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'yosys_output.log')
-        with open(log_file_path, 'w', encoding='utf-8') as lf:
+        with open(YOSYS_LOG, 'w', encoding='utf-8') as lf:
             lf.write(f"# Yosys log — run started {datetime.now().isoformat()}\n")
+        remove_log_shards()
         
-        # Start the loading animation in a separate thread
-        animation_thread = threading.Thread(target=print_loading_animation, daemon=True)
-        animation_thread.start()
+        # Start the loading animation in a separate thread (opt-in; progress is logged per file)
+        if args.animate:
+            animation_thread = threading.Thread(target=print_loading_animation, daemon=True)
+            animation_thread.start()
         
         start_time = datetime.now()
         logger.info("Starting analysis")
@@ -675,18 +1048,16 @@ def main():
         sv_files = []
         # Check generated directory structure
         if os.path.exists("generated"):
-            sv_files.extend(glob.glob("generated/**/*.sv", recursive=True))
+            sv_files.extend(iter_files("generated", '.sv', recursive=True))
             logger.info(f"Found {len(sv_files)} SystemVerilog files in generated/")
         else:
             # Fallback: look in current directory
-            sv_files.extend(glob.glob("CFG_FP_*.sv"))
-            sv_files.extend(glob.glob("FP*.sv"))
-            sv_files.extend(glob.glob("Rial*.sv"))
+            sv_files.extend(f for f in iter_files(".", '.sv') if f.startswith(('CFG_FP_', 'FP', 'Rial')))
             logger.info(f"Found {len(sv_files)} SystemVerilog files in current directory")
         fns.extend(sv_files)
         
         # Look for VHDL files in the current directory
-        vhdl_files = glob.glob("*.vhdl")
+        vhdl_files = list(iter_files(".", '.vhdl'))
         if vhdl_files:
             logger.info(f"Found {len(vhdl_files)} VHDL files to process")
             logger.info("VHDL files found:")
@@ -696,28 +1067,30 @@ def main():
         else:
             logger.warning("No VHDL files found in current directory")
         
-        if len(sys.argv) >= 2:
+        if args.pattern:
             # Use command line argument as glob pattern (like old script)
-            fns = glob.glob(sys.argv[1], recursive=True)
-            logger.info(f"Using pattern '{sys.argv[1]}': found {len(fns)} files")
+            fns = glob.glob(args.pattern, recursive=True)
+            logger.info(f"Using pattern '{args.pattern}': found {len(fns)} files")
         
         if not fns:
             logger.warning("No files found to process")
             return
         
         logger.info(f"Found {len(fns)} total files to process")
+        pretty_names = {fn: prettify_name(fn) for fn in fns}
         
         # Process files in parallel
-        results = process_files(fns)
-        
-        # Print processing results
-        successful_files = []
-        failed_files = []
-        for fn, (wire_bits, cells) in results.items():
-            if cells > 0:
-                successful_files.append((fn, cells))
-            else:
-                failed_files.append(fn)
+        logger.info(f"Using {args.jobs} parallel workers ({MAX_WORKERS} CPUs available)")
+        results = process_files(fns, args.jobs)
+        merge_log_shards()
+        direct, preprocessed = count_direct_reads()
+        if direct or preprocessed:
+            logger.info(f"Direct read accepted for {direct} SV files, {preprocessed} needed preprocessing")
+        
+        # Print processing results (largest designs first)
+        successful_files = [(fn, cells) for fn, (_, cells) in results.items() if cells > 0]
+        failed_files = [fn for fn, (_, cells) in results.items() if cells <= 0]
+        successful_files.sort(key=itemgetter(1), reverse=True)
         
         logger.info(f"Successfully processed {len(successful_files)} files:")
         for fn, cells in successful_files:
@@ -727,27 +1100,25 @@ def main():
             logger.warning(f"Failed to process {len(failed_files)} files:")
             
             # Analyze failure reasons from log file
-            error_types = {}
-            log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'yosys_output.log')
-            if os.path.exists(log_file_path):
+            error_types = Counter()
+            if os.path.exists(YOSYS_LOG):
                 try:
-                    with open(log_file_path, 'r', encoding='utf-8') as log_f:
+                    with open(YOSYS_LOG, 'r', encoding='utf-8') as log_f:
                         log_content = log_f.read()
-                        for fn in failed_files:
-                            # Find errors for this file in the log
-                            fn_base = os.path.basename(fn)
-                            pattern = rf'=== Processing {re.escape(fn)} ===.*?Yosys stderr:\n(.*?)(?=\n===|\Z)'
-                            match = re.search(pattern, log_content, re.DOTALL)
-                            if match:
-                                stderr = match.group(1)
-                                if 'TOK_AUTOMATIC' in stderr:
-                                    error_types['automatic keyword'] = error_types.get('automatic keyword', 0) + 1
-                                elif "Can't open include file" in stderr:
-                                    error_types['missing include'] = error_types.get('missing include', 0) + 1
-                                elif "syntax error" in stderr and "unexpected '['" in stderr:
-                                    error_types['unpacked arrays'] = error_types.get('unpacked arrays', 0) + 1
-                                elif "syntax error" in stderr:
-                                    error_types['other syntax errors'] = error_types.get('other syntax errors', 0) + 1
+                    # Single pass over the log: stderr of each failed file's (first) section
+                    failed_set = set(failed_files)
+                    stderr_by_file = {}
+                    for m in _SECTION_RE.finditer(log_content):
+                        fn = m.group(1)
+                        if fn in failed_set and fn not in stderr_by_file:
+                            err = _STDERR_RE.search(m.group(2))
+                            if err:
+                                stderr_by_file[fn] = err.group(1)
+                    for fn in failed_files:
+                        stderr = stderr_by_file.get(fn)
+                        error_type = _classify_stderr(stderr) if stderr is not None else None
+                        if error_type:
+                            error_types[error_type] += 1
                 except Exception as e:
                     logger.debug(f"Could not analyze error types: {e}")
             
@@ -760,7 +1131,7 @@ def main():
             logger.info(f"  Successfully processed {len(successful_files)}/{len(fns)} files ({100*len(successful_files)//len(fns)}%)")
         
         # Create XML report
-        create_xml_report(list(results.items()))
+        create_xml_report(list(results.items()), pretty_names)
         
         # Print summary
         total_cells = sum(cells[1] for _, cells in results.items())
@@ -6,6 +6,44 @@ Show detailed Yosys errors from the log file.
 import re
 import sys
 import os
+import mmap
+from collections import defaultdict
+
+# Log sections, scanned as bytes over an mmap of the log
+_SECTION_RE = re.compile(rb'=== Processing (.*?) ===(.*?)(?=\n=== Processing|\Z)', re.DOTALL)
+_STDERR_RE = re.compile(rb'Yosys stderr:\n(.*?)(?=\n===|\Z)', re.DOTALL)
+
+# Error line categories, in priority order: (substring, match the lowercased line?, label)
+_LINE_CATEGORIES = (
+    ('TOK_AUTOMATIC', False, 'automatic keyword'),
+    ('automatic', True, 'automatic keyword'),
+    ("unexpected '['", False, 'unpacked arrays/syntax'),
+    ('OP_CAST', False, 'unpacked arrays/syntax'),
+    ('unpacked', True, 'unpacked arrays/syntax'),
+    ('Invalid nesting', False, 'invalid nesting'),
+    ("Can't open include", False, 'missing include'),
+)
+
+def categorize_error(error):
+    """Return the label of the first _LINE_CATEGORIES substring found in an error line, or 'other'."""
+    lower = error.lower()
+    for token, lowered, label in _LINE_CATEGORIES:
+        if token in (lower if lowered else error):
+            return label
+    return 'other'
+
+def iter_stderr_sections(log_file):
+    """Yield (file_path, stderr) for each processing section that has an ERROR in its stderr."""
+    with open(log_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Find all processing sections; decode only the ones with errors
+            for match in _SECTION_RE.finditer(mm):
+                stderr_match = _STDERR_RE.search(mm, match.start(2), match.end(2))
+                if stderr_match and b'ERROR' in stderr_match.group(1):
+                    yield (match.group(1).decode('utf-8', errors='replace').strip(),
+                           stderr_match.group(1).decode('utf-8', errors='replace').strip())
 
 def extract_errors(log_file="yosys_output.log"):
     """Extract and display errors from Yosys log."""
@@ -13,42 +51,20 @@ def extract_errors(log_file="yosys_output.log"):
         print(f"Error: {log_file} not found")
         return
     
-    with open(log_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find all processing sections
-    pattern = r'=== Processing (.*?) ===(.*?)(?=\n=== Processing|\Z)'
-    matches = re.finditer(pattern, content, re.DOTALL)
-    
     errors_by_file = {}
-    errors_by_type = {}
+    errors_by_type = defaultdict(list)
     
-    for match in matches:
-        file_path = match.group(1).strip()
-        section = match.group(2)
-        
-        # Extract stderr section
-        stderr_match = re.search(r'Yosys stderr:\n(.*?)(?=\n===|\Z)', section, re.DOTALL)
-        if stderr_match:
-            stderr = stderr_match.group(1).strip()
-            if stderr and 'ERROR' in stderr:
-                # Extract error lines
-                error_lines = [line.strip() for line in stderr.split('\n') if 'ERROR' in line]
-                if error_lines:
-                    errors_by_file[file_path] = error_lines
-                    
-                    # Categorize errors
-                    for error in error_lines:
-                        if 'TOK_AUTOMATIC' in error or 'automatic' in error.lower():
-                            errors_by_type.setdefault('automatic keyword', []).append(file_path)
-                        elif "unexpected '['" in error or 'OP_CAST' in error or 'unpacked' in error.lower():
-                            errors_by_type.setdefault('unpacked arrays/syntax', []).append(file_path)
-                        elif "Invalid nesting" in error:
-                            errors_by_type.setdefault('invalid nesting', []).append(file_path)
-                        elif "Can't open include" in error:
-                            errors_by_type.setdefault('missing include', []).append(file_path)
-                        else:
-                            errors_by_type.setdefault('other', []).append(file_path)
+    for file_path, stderr in iter_stderr_sections(log_file):
+        # Extract error lines
+        error_lines = [line.strip() for line in stderr.split('\n') if 'ERROR' in line]
+        if error_lines:
+            basename = os.path.basename(file_path)
+            errors_by_file[file_path] = (basename, error_lines)
+            
+            # Categorize errors
+            for error in error_lines:
+                error_type = categorize_error(error)
+                errors_by_type[error_type].append((file_path, basename))
     
     # Display results
     print("=" * 80)
@@ -60,10 +76,10 @@ def extract_errors(log_file="yosys_output.log"):
         print("Errors by Type:")
         print("-" * 80)
         for error_type, files in errors_by_type.items():
-            unique_files = list(set(files))  # Remove duplicates
+            unique_files = list(dict.fromkeys(files))  # Remove duplicates, keep first-seen order
             print(f"\n{error_type}: {len(unique_files)} files")
-            for f in unique_files[:10]:  # Show first 10
-                print(f"  - {os.path.basename(f)}")
+            for _, basename in unique_files[:10]:  # Show first 10
+                print(f"  - {basename}")
             if len(unique_files) > 10:
                 print(f"  ... and {len(unique_files) - 10} more")
         print()
@@ -74,8 +90,8 @@ def extract_errors(log_file="yosys_output.log"):
     print()
     
     # Show detailed errors for each file (limit to first 20)
-    for i, (file_path, error_lines) in enumerate(list(errors_by_file.items())[:20]):
-        print(f"\n{os.path.basename(file_path)}:")
+    for i, (basename, error_lines) in enumerate(list(errors_by_file.values())[:20]):
+        print(f"\n{basename}:")
         for error in error_lines[:3]:  # Show first 3 errors per file
             print(f"  {error}")
         if len(error_lines) > 3:
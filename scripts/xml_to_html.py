@@ -3,400 +3,411 @@
 Convert cell_count_report.xml to an HTML report with visualizations.
 """
 
-import xml.etree.ElementTree as ET
+try:
+    # lxml's C parser is faster when available; the stdlib ElementTree API is the same here
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+import html
+import hashlib
+import json
 import sys
 import os
 from datetime import datetime
+from pathlib import Path
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, Optional
+
+WRITE_BUFFER_SIZE = 1 << 20  # Output file buffer; the report is written section by section
+
+# Sidecar next to the HTML file recording the sources (path -> content hash) it was built from
+STAMP_SUFFIX = ".sources.json"
+
+# Report stylesheet, written next to the HTML file and linked from it
+CSS_FILE = "report.css"
+CSS_CONTENT = """* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+    background: #1a1a2e;
+    padding: 20px;
+    min-height: 100vh;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background: white;
+    border-radius: 4px;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.4);
+    overflow: hidden;
+}
+
+.header {
+    background: #16213e;
+    color: #e8e8e8;
+    padding: 40px;
+    text-align: center;
+    border-bottom: 2px solid #0f3460;
+}
+
+.header h1 {
+    font-size: 2.2em;
+    margin-bottom: 10px;
+    font-weight: 700;
+}
+
+.header p {
+    font-size: 1em;
+    opacity: 0.9;
+}
+
+.tech-badge {
+    display: inline-block;
+    margin-top: 12px;
+    padding: 6px 16px;
+    background: #0f3460;
+    border: 1px solid #e94560;
+    border-radius: 4px;
+    font-size: 0.85em;
+    font-weight: 500;
+    letter-spacing: 0.5px;
+    color: #e94560;
+}
+
+.estimate-notice {
+    display: block;
+    margin-top: 8px;
+    font-size: 0.9em;
+    color: #a0a0a0;
+    font-style: italic;
+}
+
+.summary {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+    gap: 15px;
+    padding: 25px;
+    background: #f5f5f5;
+}
+
+.summary-card {
+    background: white;
+    padding: 20px;
+    border-radius: 4px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    text-align: center;
+    border-left: 3px solid #0f3460;
+}
+
+.summary-card h3 {
+    color: #0f3460;
+    font-size: 0.8em;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    margin-bottom: 8px;
+    font-weight: 600;
+}
+
+.summary-card .value {
+    font-size: 1.6em;
+    font-weight: 700;
+    color: #16213e;
+    font-family: 'Courier New', monospace;
+}
+
+.summary-card .unit {
+    font-size: 0.8em;
+    color: #666;
+    margin-left: 4px;
+}
+
+.content {
+    padding: 25px;
+}
+
+.section-title {
+    font-size: 1.3em;
+    color: #16213e;
+    margin-bottom: 15px;
+    padding-bottom: 8px;
+    border-bottom: 2px solid #0f3460;
+    font-weight: 600;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-top: 15px;
+    background: white;
+    font-size: 0.9em;
+}
+
+thead {
+    background: #16213e;
+    color: #e8e8e8;
+}
+
+th {
+    padding: 12px 15px;
+    text-align: left;
+    font-weight: 600;
+    text-transform: uppercase;
+    font-size: 0.8em;
+    letter-spacing: 0.5px;
+}
+
+td {
+    padding: 10px 15px;
+    border-bottom: 1px solid #e0e0e0;
+}
+
+tbody tr:hover {
+    background: #f8f8f8;
+}
+
+tbody tr:last-child td {
+    border-bottom: none;
+}
+
+.module-name {
+    font-weight: 600;
+    color: #0f3460;
+    font-family: 'Courier New', monospace;
+    font-size: 0.85em;
+}
+
+.number {
+    font-family: 'Courier New', monospace;
+    text-align: right;
+}
+
+.footer {
+    padding: 15px;
+    text-align: center;
+    color: #555;
+    font-size: 0.8em;
+    background: #f0f0f0;
+    border-top: 1px solid #ddd;
+}
+
+.category-badge {
+    display: inline-block;
+    padding: 3px 8px;
+    border-radius: 3px;
+    font-size: 0.7em;
+    font-weight: 600;
+    margin-left: 8px;
+}
+
+.badge-openfloat {
+    background: #1a3a5c;
+    color: #4da6ff;
+}
+
+.badge-hardfloat {
+    background: #3d2c1a;
+    color: #ffb74d;
+}
+
+.badge-rial {
+    background: #2d1a3d;
+    color: #ce93d8;
+}
+
+.tabs {
+    display: flex;
+    gap: 4px;
+    margin-bottom: 20px;
+    border-bottom: 2px solid #e0e0e0;
+    padding-bottom: 0;
+}
+
+.tab-btn {
+    padding: 10px 20px;
+    border: none;
+    background: #e8e8e8;
+    color: #333;
+    font-size: 0.95em;
+    font-weight: 600;
+    cursor: pointer;
+    border-radius: 4px 4px 0 0;
+    transition: background 0.2s, color 0.2s;
+}
+
+.tab-btn:hover {
+    background: #d0d0d0;
+}
+
+.tab-btn.active {
+    background: #16213e;
+    color: #e8e8e8;
+    border-bottom: 2px solid #16213e;
+    margin-bottom: -2px;
+}
+
+.tab-panel {
+    display: none;
+}
+
+.tab-panel.active {
+    display: block;
+}
+
+.tab-panel .tab-count {
+    font-size: 0.85em;
+    color: #666;
+    margin-left: 8px;
+    font-weight: normal;
+}
+
+.tool-tabs {
+    display: flex;
+    gap: 0;
+    padding: 0 25px;
+    background: #e0e0e0;
+    border-bottom: 2px solid #0f3460;
+}
+
+.tool-tab {
+    padding: 12px 24px;
+    border: none;
+    background: transparent;
+    color: #555;
+    font-size: 1em;
+    font-weight: 600;
+    cursor: pointer;
+    border-bottom: 3px solid transparent;
+    margin-bottom: -2px;
+    transition: background 0.2s, color 0.2s;
+}
+
+.tool-tab:hover {
+    background: #d0d0d0;
+    color: #333;
+}
+
+.tool-tab.active {
+    background: white;
+    color: #16213e;
+    border-bottom-color: #16213e;
+}
+
+.tool-content {
+    display: none;
+}
+
+.tool-content.active {
+    display: block;
+}
+
+.coming-soon {
+    text-align: center;
+    padding: 60px 25px;
+    color: #666;
+}
+
+.coming-soon h3 {
+    font-size: 1.5em;
+    color: #16213e;
+    margin-bottom: 12px;
+}
+
+.coming-soon p {
+    max-width: 480px;
+    margin: 0 auto;
+    line-height: 1.5;
+}
+
+@media (max-width: 768px) {
+    .header h1 { font-size: 1.5em; }
+    table { font-size: 0.8em; }
+    th, td { padding: 8px; }
+}
+"""
 
-def generate_html_report(xml_file: str, output_file: str):
-    """Generate HTML report from XML file."""
-    
-    # Parse XML
-    try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-    except FileNotFoundError:
-        print(f"Error: XML file not found: {xml_file}")
-        sys.exit(1)
-    except ET.ParseError as e:
-        print(f"Error parsing XML: {e}")
-        sys.exit(1)
-    
-    # Extract data
-    timestamp = root.find('Timestamp').text if root.find('Timestamp') is not None else "Unknown"
-    summary = root.find('Summary')
-    if summary is None:
-        total_cells = "0"
-        total_area = "0"
-        area_per_cell = "100"
-        tech_node = "7nm"
-    else:
-        total_cells = summary.find('TotalCells').text if summary.find('TotalCells') is not None else "0"
-        total_area = summary.find('TotalArea_nm2').text if summary.find('TotalArea_nm2') is not None else "0"
-        el = summary.find('AreaPerCell_nm2')
-        area_per_cell = el.text if el is not None and el.text else "100"
-        el = summary.find('TechnologyNode')
-        tech_node = el.text if el is not None and el.text else "7nm"
-    
-    modules = root.find('Modules')
-    module_data = []
-    if modules is not None:
-        for module in modules.findall('Module'):
-            name = module.find('Name').text if module.find('Name') is not None else "Unknown"
-            wire_bits = module.find('WireBits').text if module.find('WireBits') is not None else "0"
-            cells = module.find('Cells').text if module.find('Cells') is not None else "0"
-            area = module.find('Area_nm2').text if module.find('Area_nm2') is not None else "0"
-            module_data.append({
-                'name': name,
-                'wire_bits': int(wire_bits),
-                'cells': int(cells),
-                'area': float(area)
-            })
-    
-    # Assign library (tab) from path
-    def get_lib(full_name: str) -> str:
-        n = full_name.lower()
-        if "openfloat" in n:
-            return "openfloat"
-        if "hardfloat" in n:
-            return "hardfloat"
-        if "rial" in n:
-            return "rial"
-        return "other"
-
-    for m in module_data:
-        m['lib'] = get_lib(m['name'])
-
-    # Sort all by area (largest first)
-    module_data.sort(key=lambda x: x['area'], reverse=True)
-
-    # Group by library for tabs (each group sorted by area)
-    lib_order = ("openfloat", "hardfloat", "rial", "other")
-    by_lib = {}
-    for lib in lib_order:
-        by_lib[lib] = [m for m in module_data if m['lib'] == lib]
-    by_lib["all"] = list(module_data)
-
-    # Format total cells with commas
-    total_cells_int = int(total_cells)
-    total_area_float = float(total_area)
-    total_area_mm2 = total_area_float / 1e6  # Convert nm² to mm²
-
-    # Footer line (built here so f-string interpolation is guaranteed)
-    footer_area_line = f"Yosys Synthesis Estimate | Area: {area_per_cell} nm²/cell ({tech_node} assumption)"
+# Path prefixes stripped from module names for display
+_DISPLAY_PREFIXES = ("generated/rial/", "generated/openfloat/", "generated/hardfloat/")
+# Badge (class, text) per library; "other" gets no badge
+_BADGES = {
+    "openfloat": ("badge-openfloat", "OpenFloat"),
+    "hardfloat": ("badge-hardfloat", "HardFloat"),
+    "rial": ("badge-rial", "Rial"),
+}
+# Badge markup is the same for every module of a library, so render it once
+_BADGE_HTML = {lib: f'<span class="category-badge {cls}">{text}</span>' for lib, (cls, text) in _BADGES.items()}
+# One table row (fields are preformatted strings, so the template has no format specs)
+_ROW_TMPL = """                    <tr>
+                        <td><span class="module-name">{display_name}</span>{badge_html}</td>
+                        <td class="number">{wire_bits_str}</td>
+                        <td class="number">{cells_str}</td>
+                        <td class="number">{area_str}</td>
+                    </tr>
+"""
 
-    # Generate HTML
-    html_content = f"""<!DOCTYPE html>
+@dataclass
+class ModuleRow:
+    """A Module from the XML report with its display fields precomputed."""
+    __slots__ = ('name', 'wire_bits', 'cells', 'area', 'lib', 'display_name', 'badge_html', 'row_html')
+    name: str
+    wire_bits: int
+    cells: int
+    area: float
+    lib: str
+    display_name: str
+    badge_html: str
+    row_html: str
+
+def get_lib(full_name: str) -> str:
+    """Library (tab) of a module path, or "other"."""
+    n = full_name.lower()
+    if "openfloat" in n:
+        return "openfloat"
+    if "hardfloat" in n:
+        return "hardfloat"
+    if "rial" in n:
+        return "rial"
+    return "other"
+
+def module_row(name: str, wire_bits: int, cells: int, area: float) -> ModuleRow:
+    """Build a ModuleRow, deriving library (tab), display name, badge and row HTML once
+    (each row is shown in "all" and its own tab)."""
+    lib = get_lib(name)
+    display_name = name
+    for prefix in _DISPLAY_PREFIXES:
+        if name.startswith(prefix):
+            display_name = name[len(prefix):]
+            break
+    # Module names are interpolated into HTML: escape once here
+    display_name = html.escape(display_name, quote=False)
+    badge_html = _BADGE_HTML.get(lib, '')
+    row = _ROW_TMPL.format(display_name=display_name, badge_html=badge_html,
+                           wire_bits_str=f"{wire_bits:,}", cells_str=f"{cells:,}", area_str=f"{area:,.0f}")
+    return ModuleRow(name, wire_bits, cells, area, lib, display_name, badge_html, row)
+
+def _write_css(css_path: Path) -> None:
+    """Write the stylesheet unless an identical copy is already there."""
+    try:
+        if css_path.read_text(encoding='utf-8') == CSS_CONTENT:
+            return
+    except OSError:
+        pass
+    css_path.write_text(CSS_CONTENT, encoding='utf-8')
+
+# Static page head and tail, built once at import; only the per-report values are
+# substituted at write time
+_HEADER_TMPL = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>PPA Analysis Report</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: #1a1a2e;
-            padding: 20px;
-            min-height: 100vh;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 4px;
-            box-shadow: 0 4px 20px rgba(0,0,0,0.4);
-            overflow: hidden;
-        }}
-
-        .header {{
-            background: #16213e;
-            color: #e8e8e8;
-            padding: 40px;
-            text-align: center;
-            border-bottom: 2px solid #0f3460;
-        }}
-
-        .header h1 {{
-            font-size: 2.2em;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }}
-
-        .header p {{
-            font-size: 1em;
-            opacity: 0.9;
-        }}
-
-        .tech-badge {{
-            display: inline-block;
-            margin-top: 12px;
-            padding: 6px 16px;
-            background: #0f3460;
-            border: 1px solid #e94560;
-            border-radius: 4px;
-            font-size: 0.85em;
-            font-weight: 500;
-            letter-spacing: 0.5px;
-            color: #e94560;
-        }}
-
-        .estimate-notice {{
-            display: block;
-            margin-top: 8px;
-            font-size: 0.9em;
-            color: #a0a0a0;
-            font-style: italic;
-        }}
-
-        .summary {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-            gap: 15px;
-            padding: 25px;
-            background: #f5f5f5;
-        }}
-
-        .summary-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 4px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            text-align: center;
-            border-left: 3px solid #0f3460;
-        }}
-
-        .summary-card h3 {{
-            color: #0f3460;
-            font-size: 0.8em;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            margin-bottom: 8px;
-            font-weight: 600;
-        }}
-
-        .summary-card .value {{
-            font-size: 1.6em;
-            font-weight: 700;
-            color: #16213e;
-            font-family: 'Courier New', monospace;
-        }}
-
-        .summary-card .unit {{
-            font-size: 0.8em;
-            color: #666;
-            margin-left: 4px;
-        }}
-
-        .content {{
-            padding: 25px;
-        }}
-
-        .section-title {{
-            font-size: 1.3em;
-            color: #16213e;
-            margin-bottom: 15px;
-            padding-bottom: 8px;
-            border-bottom: 2px solid #0f3460;
-            font-weight: 600;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-            background: white;
-            font-size: 0.9em;
-        }}
-
-        thead {{
-            background: #16213e;
-            color: #e8e8e8;
-        }}
-
-        th {{
-            padding: 12px 15px;
-            text-align: left;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 0.8em;
-            letter-spacing: 0.5px;
-        }}
-
-        td {{
-            padding: 10px 15px;
-            border-bottom: 1px solid #e0e0e0;
-        }}
-
-        tbody tr:hover {{
-            background: #f8f8f8;
-        }}
-
-        tbody tr:last-child td {{
-            border-bottom: none;
-        }}
-
-        .module-name {{
-            font-weight: 600;
-            color: #0f3460;
-            font-family: 'Courier New', monospace;
-            font-size: 0.85em;
-        }}
-
-        .number {{
-            font-family: 'Courier New', monospace;
-            text-align: right;
-        }}
-
-        .footer {{
-            padding: 15px;
-            text-align: center;
-            color: #555;
-            font-size: 0.8em;
-            background: #f0f0f0;
-            border-top: 1px solid #ddd;
-        }}
-
-        .category-badge {{
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-size: 0.7em;
-            font-weight: 600;
-            margin-left: 8px;
-        }}
-
-        .badge-openfloat {{
-            background: #1a3a5c;
-            color: #4da6ff;
-        }}
-
-        .badge-hardfloat {{
-            background: #3d2c1a;
-            color: #ffb74d;
-        }}
-
-        .badge-rial {{
-            background: #2d1a3d;
-            color: #ce93d8;
-        }}
-
-        .tabs {{
-            display: flex;
-            gap: 4px;
-            margin-bottom: 20px;
-            border-bottom: 2px solid #e0e0e0;
-            padding-bottom: 0;
-        }}
-
-        .tab-btn {{
-            padding: 10px 20px;
-            border: none;
-            background: #e8e8e8;
-            color: #333;
-            font-size: 0.95em;
-            font-weight: 600;
-            cursor: pointer;
-            border-radius: 4px 4px 0 0;
-            transition: background 0.2s, color 0.2s;
-        }}
-
-        .tab-btn:hover {{
-            background: #d0d0d0;
-        }}
-
-        .tab-btn.active {{
-            background: #16213e;
-            color: #e8e8e8;
-            border-bottom: 2px solid #16213e;
-            margin-bottom: -2px;
-        }}
-
-        .tab-panel {{
-            display: none;
-        }}
-
-        .tab-panel.active {{
-            display: block;
-        }}
-
-        .tab-panel .tab-count {{
-            font-size: 0.85em;
-            color: #666;
-            margin-left: 8px;
-            font-weight: normal;
-        }}
-
-        .tool-tabs {{
-            display: flex;
-            gap: 0;
-            padding: 0 25px;
-            background: #e0e0e0;
-            border-bottom: 2px solid #0f3460;
-        }}
-
-        .tool-tab {{
-            padding: 12px 24px;
-            border: none;
-            background: transparent;
-            color: #555;
-            font-size: 1em;
-            font-weight: 600;
-            cursor: pointer;
-            border-bottom: 3px solid transparent;
-            margin-bottom: -2px;
-            transition: background 0.2s, color 0.2s;
-        }}
-
-        .tool-tab:hover {{
-            background: #d0d0d0;
-            color: #333;
-        }}
-
-        .tool-tab.active {{
-            background: white;
-            color: #16213e;
-            border-bottom-color: #16213e;
-        }}
-
-        .tool-content {{
-            display: none;
-        }}
-
-        .tool-content.active {{
-            display: block;
-        }}
-
-        .coming-soon {{
-            text-align: center;
-            padding: 60px 25px;
-            color: #666;
-        }}
-
-        .coming-soon h3 {{
-            font-size: 1.5em;
-            color: #16213e;
-            margin-bottom: 12px;
-        }}
-
-        .coming-soon p {{
-            max-width: 480px;
-            margin: 0 auto;
-            line-height: 1.5;
-        }}
-
-        @media (max-width: 768px) {{
-            .header h1 {{ font-size: 1.5em; }}
-            table {{ font-size: 0.8em; }}
-            th, td {{ padding: 8px; }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{css_file}">
 </head>
 <body>
     <div class="container">
@@ -410,11 +421,11 @@ def generate_html_report(xml_file: str, output_file: str):
         <div class="summary">
             <div class="summary-card">
                 <h3>Total Modules</h3>
-                <div class="value">{len(module_data)}<span class="unit">modules</span></div>
+                <div class="value">{module_count}<span class="unit">modules</span></div>
             </div>
             <div class="summary-card">
                 <h3>Total Cells</h3>
-                <div class="value">{total_cells_int:,}<span class="unit">cells</span></div>
+                <div class="value">{total_cells:,}<span class="unit">cells</span></div>
             </div>
             <div class="summary-card">
                 <h3>Total Area</h3>
@@ -442,62 +453,7 @@ def generate_html_report(xml_file: str, output_file: str):
             </div>
 """
 
-    def row_html(module):
-        full_name = module['name']
-        wire_bits = module['wire_bits']
-        cells = module['cells']
-        area = module['area']
-        display_name = full_name
-        for prefix in ("generated/rial/", "generated/openfloat/", "generated/hardfloat/"):
-            if full_name.startswith(prefix):
-                display_name = full_name[len(prefix):]
-                break
-        badge_class = ""
-        badge_text = ""
-        if "openfloat" in full_name.lower():
-            badge_class = "badge-openfloat"
-            badge_text = "OpenFloat"
-        elif "hardfloat" in full_name.lower():
-            badge_class = "badge-hardfloat"
-            badge_text = "HardFloat"
-        elif "rial" in full_name.lower():
-            badge_class = "badge-rial"
-            badge_text = "Rial"
-        badge_html = f'<span class="category-badge {badge_class}">{badge_text}</span>' if badge_text else ''
-        return f"""                    <tr>
-                        <td><span class="module-name">{display_name}</span>{badge_html}</td>
-                        <td class="number">{wire_bits:,}</td>
-                        <td class="number">{cells:,}</td>
-                        <td class="number">{area:,.0f}</td>
-                    </tr>
-"""
-
-    tab_labels = {"all": "All", "openfloat": "OpenFloat", "hardfloat": "HardFloat", "rial": "Rial"}
-    for tab_id in ("all", "openfloat", "hardfloat", "rial"):
-        rows = by_lib.get(tab_id, [])
-        active = " active" if tab_id == "all" else ""
-        count = len(rows)
-        html_content += f"""
-            <div class="tab-panel{active}" id="panel-{tab_id}" role="tabpanel" aria-labelledby="tab-{tab_id}">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Module Name</th>
-                            <th>Wire Bits</th>
-                            <th>Cells</th>
-                            <th>Area (nm²)</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
-        for module in rows:
-            html_content += row_html(module)
-        html_content += """                    </tbody>
-                </table>
-            </div>
-"""
-
-    html_content += """
+_FOOTER_TMPL = """
         </div>
         </div>
 
@@ -510,7 +466,7 @@ def generate_html_report(xml_file: str, output_file: str):
         </div>
 
         <div class="footer" id="footer-yosys-only">
-            <p>FOOTER_AREA_LINE</p>
+            <p>{footer_area_line}</p>
             <p style="color:#888; font-size:0.75em; margin-top:4px;">Note: Preliminary estimates without PDK. Actual silicon area will vary.</p>
         </div>
     </div>
@@ -543,13 +499,141 @@ def generate_html_report(xml_file: str, output_file: str):
 </body>
 </html>
 """
+
+def _write_header(f, timestamp: str, tech_node: str, module_count: int, total_cells: int,
+                  total_area_mm2: float) -> None:
+    """Write the document head, summary cards and tab buttons."""
+    f.write(_HEADER_TMPL.format(css_file=CSS_FILE, timestamp=timestamp, tech_node=tech_node,
+                                 module_count=module_count, total_cells=total_cells,
+                                 total_area_mm2=total_area_mm2))
+
+def _write_tab(f, tab_id: str, rows: list) -> None:
+    """Write one tab panel with a table row per module."""
+    active = " active" if tab_id == "all" else ""
+    f.write(f"""
+            <div class="tab-panel{active}" id="panel-{tab_id}" role="tabpanel" aria-labelledby="tab-{tab_id}">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Module Name</th>
+                            <th>Wire Bits</th>
+                            <th>Cells</th>
+                            <th>Area (nm²)</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+""")
+    # Join the tab's rows and write once (writelines would still do one write() per row)
+    f.write(''.join([module.row_html for module in rows]))
+    f.write("""                    </tbody>
+                </table>
+            </div>
+""")
+
+def _write_footer(f, area_per_cell: str, tech_node: str) -> None:
+    """Write the OpenROAD placeholder, footer and tab scripts."""
+    footer_area_line = f"Yosys Synthesis Estimate | Area: {area_per_cell} nm²/cell ({tech_node} assumption)"
+    f.write(_FOOTER_TMPL.format(footer_area_line=footer_area_line))
+
+def _parse_int(text: str) -> int:
+    """Parse an integer field, accepting decimal text such as '123.0'."""
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+def _source_stamp(*sources: str) -> Optional[Dict[str, str]]:
+    """Absolute path -> content hash of each source file (None if one can't be read)."""
+    stamp = {}
+    try:
+        for src in sources:
+            with open(src, 'rb') as f:
+                stamp[os.path.abspath(src)] = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except OSError:
+        return None
+    return stamp
+
+def _is_up_to_date(output_file: str, stamp: Optional[Dict[str, str]]) -> bool:
+    """True if output_file exists and its sidecar records exactly these sources."""
+    if stamp is None or not os.path.exists(output_file):
+        return False
+    try:
+        with open(output_file + STAMP_SUFFIX, 'r', encoding='utf-8') as f:
+            return json.load(f) == stamp
+    except (OSError, ValueError):
+        return False
+
+def generate_html_report(xml_file: str, output_file: str):
+    """Generate HTML report from XML file (skipped if the report is already up to date)."""
+    
+    # Fast path: nothing to do if the report was built from this same XML and script
+    stamp = _source_stamp(xml_file, __file__)
+    if Path(output_file).with_name(CSS_FILE).exists() and _is_up_to_date(output_file, stamp):
+        print(f"HTML report up to date: {output_file}")
+        return
+    
+    # Stream-parse XML: each Module's children are read in one pass, then the element is freed
+    timestamp = "Unknown"
+    summary = {}
+    module_data = []
+    try:
+        for _, elem in ET.iterparse(xml_file, events=('end',)):
+            tag = elem.tag
+            if tag == 'Module':
+                vals = {c.tag: c.text for c in elem}
+                module_data.append(module_row(vals.get('Name') or "Unknown",
+                                              int(vals.get('WireBits') or 0),
+                                              int(vals.get('Cells') or 0),
+                                              float(vals.get('Area_nm2') or 0)))
+                elem.clear()
+            elif tag == 'Timestamp':
+                timestamp = elem.text or "Unknown"
+            elif tag == 'Summary':
+                summary = {c.tag: c.text for c in elem}
+    except FileNotFoundError:
+        print(f"Error: XML file not found: {xml_file}")
+        sys.exit(1)
+    except ET.ParseError as e:
+        print(f"Error parsing XML: {e}")
+        sys.exit(1)
     
-    html_content = html_content.replace("FOOTER_AREA_LINE", footer_area_line)
+    # Extract summary
+    total_cells = summary.get('TotalCells') or "0"
+    total_area = summary.get('TotalArea_nm2') or "0"
+    area_per_cell = summary.get('AreaPerCell_nm2') or "100"
+    tech_node = summary.get('TechnologyNode') or "7nm"
+    # Text fields from the XML are interpolated into HTML: escape them once here
+    timestamp = html.escape(timestamp, quote=False)
+    area_per_cell = html.escape(area_per_cell, quote=False)
+    tech_node = html.escape(tech_node, quote=False)
+    
+    # Sort all by area (largest first)
+    module_data.sort(key=attrgetter('area'), reverse=True)
+
+    # Group by library for tabs (each group sorted by area)
+    lib_order = ("openfloat", "hardfloat", "rial", "other")
+    by_lib = {}
+    for lib in lib_order:
+        by_lib[lib] = [m for m in module_data if m.lib == lib]
+    by_lib["all"] = list(module_data)
 
-    # Write HTML file
-    os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Totals as ints (estimate.py writes whole numbers; the float parse is only a fallback)
+    total_cells_int = _parse_int(total_cells)
+    total_area_mm2 = _parse_int(total_area) / 1e6  # Convert nm² to mm²
+
+    # Write HTML file, streaming each section through the file buffer
+    out_path = Path(output_file)
+    if not out_path.parent.is_dir():
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_css(out_path.with_name(CSS_FILE))
+    with out_path.open('w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        _write_header(f, timestamp, tech_node, len(module_data), total_cells_int, total_area_mm2)
+        for tab_id in ("all", "openfloat", "hardfloat", "rial"):
+            _write_tab(f, tab_id, by_lib.get(tab_id, []))
+        _write_footer(f, area_per_cell, tech_node)
+    if stamp is not None:
+        with open(output_file + STAMP_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(stamp, f)
     
     print(f"HTML report generated: {output_file}")
 